@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import sys
 
 def analyze_unsafe_coverage(filename="unsafe_coverage.stat"):
     """
@@ -9,34 +10,37 @@ def analyze_unsafe_coverage(filename="unsafe_coverage.stat"):
     all_registered = set()
     all_executed = set()
 
+    # Section header -> set its lines are collected into
+    sections = {
+        "=== REGISTERED_LINES ===": all_registered,
+        "=== EXECUTED_LINES ===": all_executed,
+    }
+
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
+        f = open(filename, 'r')
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found")
         return
 
     current_section = None
 
-    for line in lines:
-        line = line.strip()
+    with f:
+        for line in f:
+            line = line.strip()
 
-        if line == "=== REGISTERED_LINES ===":
-            current_section = "registered"
-            continue
-        elif line == "=== EXECUTED_LINES ===":
-            current_section = "executed"
-            continue
-        elif line.startswith("=== ") or line == "":
-            current_section = None
-            continue
+            # Process lines that start with 'src/' first: they are nearly every
+            # line, so they skip the header checks. The same file:line recurs
+            # across runs, so intern it to keep one copy in both sets
+            if line.startswith("src/"):
+                if current_section is not None:
+                    current_section.add(sys.intern(line))
+                continue
 
-        # Process lines that start with 'src/'
-        if current_section and line.startswith("src/"):
-            if current_section == "registered":
-                all_registered.add(line)
-            elif current_section == "executed":
-                all_executed.add(line)
+            target = sections.get(line)
+            if target is not None:
+                current_section = target
+            elif line.startswith("=== ") or line == "":
+                current_section = None
 
     # Calculate coverage
     total_registered = len(all_registered)
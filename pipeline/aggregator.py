@@ -1,12 +1,45 @@
 #!/usr/bin/env python3
 import os
 import re
+import sys
 import math
+import mmap
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 
-@dataclass
+# Compiled once at import; the parsers below run them per line of every file.
+_CPU_TOTAL_RE = re.compile(r"Total cycles:\s*(\d+)")
+_CPU_UNSAFE_RE = re.compile(r"Unsafe cycles:\s*(\d+)")
+_CPU_EXTERNAL_RE = re.compile(r"External cycles:\s*(\d+)")
+_CPU_BLOCKS_RE = re.compile(r"Unsafe blocks:\s*(\d+)")
+_CPU_EXT_CALLS_RE = re.compile(r"External calls:\s*(\d+)")
+_HEAP_TOTAL_RE = re.compile(r"Total heap usage:\s*(\d+)")
+_HEAP_UNSAFE_RE = re.compile(r"Unsafe heap memory:\s*(\d+)")
+
+# Unsafe counter labels -> CrateStats field they accumulate into
+_COUNTER_FIELDS = {
+    "Total instructions": "inst_total",
+    "Unsafe instructions": "inst_unsafe",
+    "Unsafe loads": "loads_unsafe",
+    "Unsafe stores": "stores_unsafe",
+    "Unsafe calls": "calls_unsafe_inst",
+    "Unique functions": "func_total",
+    "Unique unsafe functions": "func_unsafe",
+    "Total function calls": "calls_total_dyn",
+    "Unsafe function calls": "calls_unsafe_dyn",
+}
+# Unique counts are per run, so appended runs take the max instead of the sum
+_COUNTER_MAX_FIELDS = {"func_total", "func_unsafe"}
+_COUNTER_RE = re.compile(
+    r"\s*(" + "|".join(map(re.escape, _COUNTER_FIELDS)) + r"):\s*([\d,]+)"
+)
+
+# Any "===" header line in a coverage file (RUN_n, section markers, ...)
+_COV_HEADER_RE = re.compile(rb"^[ \t]*(===[^\n]*?)[ \t\r]*$", re.M)
+
+@dataclass(slots=True)
 class CrateStats:
     name: str
     # CPU Cycle
@@ -43,6 +76,238 @@ class CrateStats:
     # SLOC (placeholder, needs static analysis or hardcoded)
     sloc: str = "-"
 
+def _parse_cpu(f: Path, crate: str) -> Dict[str, Any]:
+    """Parses a single *_cpu_cycle.stat file into CrateStats fields"""
+    fields: Dict[str, Any] = {}
+    try:
+        total_cycles = 0
+        unsafe_cycles = 0
+        external_cycles = 0
+        unsafe_blocks = 0
+        external_calls = 0
+
+        # Runs are appended, each under its own header; stream the
+        # file and sum every counter line instead of splitting blocks
+        with f.open() as fh:
+            for line in fh:
+                tc = _CPU_TOTAL_RE.search(line)
+                uc = _CPU_UNSAFE_RE.search(line)
+                ec = _CPU_EXTERNAL_RE.search(line)
+                ub = _CPU_BLOCKS_RE.search(line)
+                exc = _CPU_EXT_CALLS_RE.search(line)
+
+                if tc: total_cycles += int(tc.group(1))
+                if uc: unsafe_cycles += int(uc.group(1))
+                if ec: external_cycles += int(ec.group(1))
+                if ub: unsafe_blocks += int(ub.group(1))
+                if exc: external_calls += int(exc.group(1))
+
+        # Calculate Internal Cycles
+        internal_cycles = total_cycles - external_cycles
+        if internal_cycles < 0: internal_cycles = total_cycles # Should not happen
+
+        if internal_cycles > 0:
+            fields["cpu_unsafe_pct"] = (unsafe_cycles / internal_cycles) * 100.0
+        else:
+            fields["cpu_unsafe_pct"] = 0.0
+
+    except Exception as e:
+        print(f"Error parsing CPU stats for {crate}: {e}")
+    return fields
+
+def _parse_heap(f: Path, crate: str) -> Dict[str, Any]:
+    """Parses a single *_heap_stat.stat file into CrateStats fields"""
+    fields: Dict[str, Any] = {}
+    try:
+        # Aggregate multiple runs if present (file appended)
+        # We'll take the SUM of all blocks? Or the LAST one?
+        # Heap tracker appends. The aggregator usually sums.
+        # Let's sum totals.
+        
+        total_usage = 0
+        unsafe_mem = 0
+        
+        with f.open() as fh:
+            for line in fh:
+                tu = _HEAP_TOTAL_RE.search(line)
+                um = _HEAP_UNSAFE_RE.search(line)
+
+                if tu: total_usage += int(tu.group(1))
+                if um: unsafe_mem += int(um.group(1))
+        
+        fields["heap_total_usage"] = total_usage
+        fields["heap_unsafe_usage"] = unsafe_mem
+        if total_usage > 0:
+            fields["heap_unsafe_pct"] = (unsafe_mem / total_usage) * 100.0
+    except Exception as e:
+        print(f"Error parsing Heap stats for {crate}: {e}")
+    return fields
+
+def _parse_counter(f: Path, crate: str) -> Dict[str, Any]:
+    """Parses a single *_unsafe_counter.stat file into CrateStats fields"""
+    fields: Dict[str, Any] = {}
+    try:
+        # Summing logic for appended runs
+        totals = dict.fromkeys(_COUNTER_FIELDS.values(), 0)
+        with f.open() as fh:
+            for line in fh:
+                m = _COUNTER_RE.match(line)
+                if not m: continue
+                field = _COUNTER_FIELDS[m.group(1)]
+                # The regex only captures digits and commas, so no strip is
+                # needed; replace() beats a str.translate deletion table on
+                # values this short
+                val = int(m.group(2).replace(",", ""))
+                if field in _COUNTER_MAX_FIELDS:
+                    totals[field] = max(totals[field], val)
+                else:
+                    totals[field] += val
+
+        total_inst = totals["inst_total"]
+        unsafe_inst = totals["inst_unsafe"]
+        total_func = totals["func_total"]
+        unsafe_func = totals["func_unsafe"]
+        calls_dyn = totals["calls_total_dyn"]
+        calls_unsafe_dyn = totals["calls_unsafe_dyn"]
+
+        fields["inst_total"] = total_inst
+        fields["inst_unsafe"] = unsafe_inst
+        if total_inst > 0:
+            fields["inst_unsafe_pct"] = (unsafe_inst / total_inst) * 100.0
+        
+        fields["loads_unsafe"] = totals["loads_unsafe"]
+        fields["stores_unsafe"] = totals["stores_unsafe"]
+        fields["calls_unsafe_inst"] = totals["calls_unsafe_inst"]
+
+        fields["func_total"] = total_func
+        fields["func_unsafe"] = unsafe_func
+        if total_func > 0:
+            fields["func_unsafe_pct"] = (unsafe_func / total_func) * 100.0
+
+        fields["calls_total_dyn"] = calls_dyn
+        fields["calls_unsafe_dyn"] = calls_unsafe_dyn
+        if calls_dyn > 0:
+            fields["calls_unsafe_dyn_pct"] = (calls_unsafe_dyn / calls_dyn) * 100.0
+
+    except Exception as e:
+        print(f"Error parsing Counter stats for {crate}: {e}")
+    return fields
+
+def _union_into_larger(total: set, run: set) -> set:
+    """Returns total | run, growing whichever set is larger in place.
+
+    Runs mostly repeat the same lines, so only the smaller side is rehashed
+    and the first run's set is adopted as the total without a copy.
+    """
+    if len(run) > len(total):
+        total, run = run, total
+    total |= run
+    return total
+
+def _parse_coverage(f: Path, crate: str) -> Dict[str, Any]:
+    """Parses a single *_unsafe_coverage.stat file into CrateStats fields"""
+    fields: Dict[str, Any] = {}
+    try:
+        # Parse all RUN blocks
+        # We want to identify distinct runs and filter out those with 0 execution
+        # But keep runs if they are the ONLY runs? 
+        # Heuristic: If we have multiple runs, discard the ones with 0 execution.
+        # If a run has 0 executed lines, but >0 registered lines, it might be a ghost run.
+        # However, if ALL runs have 0 executed lines, we keep them (0% coverage).
+        #
+        # Rather than keeping every run around, the current run is buffered in
+        # a single pair of sets and folded into the totals at the next RUN
+        # header: runs with execution go into final_*, ghost runs only into
+        # the fallback used when no run executed anything.
+
+        final_registered = set()
+        final_executed = set()
+        ghost_registered = set()
+        pending_reg = set()
+        pending_exec = set()
+        in_run = False # Lines before the first RUN header belong to no run
+        current_section = None
+
+        def commit_run():
+            nonlocal final_registered, final_executed, ghost_registered
+            nonlocal pending_reg, pending_exec
+            if not in_run:
+                pass
+            elif pending_exec:
+                final_registered = _union_into_larger(final_registered, pending_reg)
+                final_executed = _union_into_larger(final_executed, pending_exec)
+            else:
+                ghost_registered = _union_into_larger(ghost_registered, pending_reg)
+            # Reuse the run buffers unless a total took them over
+            if pending_reg is final_registered or pending_reg is ghost_registered:
+                pending_reg = set()
+            else:
+                pending_reg.clear()
+            if pending_exec is final_executed:
+                pending_exec = set()
+            else:
+                pending_exec.clear()
+        
+        def collect(body):
+            # Section bodies are only decoded if they are kept
+            if current_section is None: return
+            for line in body.decode().splitlines():
+                line = line.strip()
+                if line: current_section.add(sys.intern(line))
+
+        # Scan for headers over the mapped file so only section bodies are
+        # sliced out and decoded, instead of walking every line in Python
+        with f.open("rb") as fh:
+            if os.fstat(fh.fileno()).st_size:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = 0
+                    for m in _COV_HEADER_RE.finditer(mm):
+                        collect(mm[pos:m.start()])
+                        pos = m.end()
+
+                        header = m.group(1)
+                        if header.startswith(b"=== RUN_"):
+                            commit_run()
+                            in_run = True
+                            current_section = None
+                        elif header == b"=== REGISTERED_LINES ===":
+                            current_section = pending_reg
+                        elif header == b"=== EXECUTED_LINES ===":
+                            current_section = pending_exec
+                        else:
+                            current_section = None
+                    collect(mm[pos:])
+        commit_run()
+
+        if not final_executed:
+            # No run executed anything: report the ghost runs (0% coverage)
+            final_registered = ghost_registered
+                
+        fields["cov_registered"] = len(final_registered)
+        fields["cov_executed"] = len(final_executed)
+        if final_registered:
+            fields["cov_pct"] = (len(final_executed) / len(final_registered)) * 100.0
+            
+    except Exception as e:
+        print(f"Error parsing Coverage stats for {crate}: {e}")
+    return fields
+
+# Stat file suffix -> parser for that experiment's output
+_PARSERS = {
+    "_cpu_cycle.stat": _parse_cpu,
+    "_heap_stat.stat": _parse_heap,
+    "_unsafe_counter.stat": _parse_counter,
+    "_unsafe_coverage.stat": _parse_coverage,
+}
+
+# Below this many stat files collect_all parses serially without a pool
+_PARALLEL_MIN_FILES = 256
+
+def _parse_file(path: Path, suffix: str):
+    """Worker entry point: returns (crate, fields) for one stat file"""
+    crate = path.name[:-len(suffix)]
+    return crate, _PARSERS[suffix](path, crate)
+
 class Aggregator:
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
@@ -53,216 +318,65 @@ class Aggregator:
             self.stats[name] = CrateStats(name=name)
         return self.stats[name]
 
+    def merge(self, crate: str, fields: Dict[str, Any]):
+        stats = self.get_crate(crate)
+        for k, v in fields.items():
+            setattr(stats, k, v)
+
+    def _parse_glob(self, suffix: str):
+        for f in self.output_dir.glob("*" + suffix):
+            self.merge(*_parse_file(f, suffix))
+
     def parse_cpu_stats(self):
         """Parses *_cpu_cycle.stat files"""
-        for f in self.output_dir.glob("*_cpu_cycle.stat"):
-            crate = f.stem.replace("_cpu_cycle", "")
-            stats = self.get_crate(crate)
-            try:
-                content = f.read_text()
-                
-                total_cycles = 0
-                unsafe_cycles = 0
-                external_cycles = 0
-                unsafe_blocks = 0
-                external_calls = 0
-
-                # Split by the header to handle appended runs
-                blocks = content.split("===== CPU Cycle Statistics =====")
-                for block in blocks:
-                    if not block.strip(): continue
-
-                    tc = re.search(r"Total cycles:\s*(\d+)", block)
-                    uc = re.search(r"Unsafe cycles:\s*(\d+)", block)
-                    ec = re.search(r"External cycles:\s*(\d+)", block)
-                    ub = re.search(r"Unsafe blocks:\s*(\d+)", block)
-                    exc = re.search(r"External calls:\s*(\d+)", block)
-
-                    if tc: total_cycles += int(tc.group(1))
-                    if uc: unsafe_cycles += int(uc.group(1))
-                    if ec: external_cycles += int(ec.group(1))
-                    if ub: unsafe_blocks += int(ub.group(1))
-                    if exc: external_calls += int(exc.group(1))
-
-                # Calculate Internal Cycles
-                internal_cycles = total_cycles - external_cycles
-                if internal_cycles < 0: internal_cycles = total_cycles # Should not happen
-
-                if internal_cycles > 0:
-                    stats.cpu_unsafe_pct = (unsafe_cycles / internal_cycles) * 100.0
-                else:
-                    stats.cpu_unsafe_pct = 0.0
-
-            except Exception as e:
-                print(f"Error parsing CPU stats for {crate}: {e}")
+        self._parse_glob("_cpu_cycle.stat")
 
     def parse_heap_stats(self):
         """Parses *_heap_stat.stat files"""
-        for f in self.output_dir.glob("*_heap_stat.stat"):
-            crate = f.stem.replace("_heap_stat", "")
-            stats = self.get_crate(crate)
-            try:
-                content = f.read_text()
-                # Aggregate multiple runs if present (file appended)
-                # We'll take the SUM of all blocks? Or the LAST one?
-                # Heap tracker appends. The aggregator usually sums.
-                # Let's sum totals.
-                
-                total_usage = 0
-                unsafe_mem = 0
-                
-                blocks = content.split("===== Heap Usage Statistics =====")
-                for block in blocks:
-                    if not block.strip(): continue
-                    
-                    tu = re.search(r"Total heap usage:\s*(\d+)", block)
-                    um = re.search(r"Unsafe heap memory:\s*(\d+)", block)
-                    
-                    if tu: total_usage += int(tu.group(1))
-                    if um: unsafe_mem += int(um.group(1))
-                
-                stats.heap_total_usage = total_usage
-                stats.heap_unsafe_usage = unsafe_mem
-                if total_usage > 0:
-                    stats.heap_unsafe_pct = (unsafe_mem / total_usage) * 100.0
-            except Exception as e:
-                print(f"Error parsing Heap stats for {crate}: {e}")
+        self._parse_glob("_heap_stat.stat")
 
     def parse_unsafe_counter_stats(self):
         """Parses *_unsafe_counter.stat files"""
-        for f in self.output_dir.glob("*_unsafe_counter.stat"):
-            crate = f.stem.replace("_unsafe_counter", "")
-            stats = self.get_crate(crate)
-            try:
-                content = f.read_text()
-                # Summing logic for appended runs
-                
-                total_inst = 0
-                unsafe_inst = 0
-                loads = 0
-                stores = 0
-                calls = 0
-                total_func = 0
-                unsafe_func = 0
-                calls_dyn = 0
-                calls_unsafe_dyn = 0
-                
-                # Simple line-based summing
-                for line in content.splitlines():
-                    if ":" not in line: continue
-                    k, v = line.split(":", 1)
-                    val = int(v.replace(",", "").strip())
-                    
-                    if "Total instructions" in k: total_inst += val
-                    elif "Unsafe instructions" in k: unsafe_inst += val
-                    elif "Unsafe loads" in k: loads += val
-                    elif "Unsafe stores" in k: stores += val
-                    elif "Unsafe calls" in k: calls += val # instruction calls?
-                    elif "Unique functions" in k: total_func = max(total_func, val) # Max for unique? Or sum? unique is per run. use max.
-                    elif "Unique unsafe functions" in k: unsafe_func = max(unsafe_func, val)
-                    elif "Total function calls" in k: calls_dyn += val
-                    elif "Unsafe function calls" in k: calls_unsafe_dyn += val
-
-                stats.inst_total = total_inst
-                stats.inst_unsafe = unsafe_inst
-                if total_inst > 0:
-                    stats.inst_unsafe_pct = (unsafe_inst / total_inst) * 100.0
-                
-                stats.loads_unsafe = loads
-                stats.stores_unsafe = stores
-                stats.calls_unsafe_inst = calls
+        self._parse_glob("_unsafe_counter.stat")
 
-                stats.func_total = total_func
-                stats.func_unsafe = unsafe_func
-                if total_func > 0:
-                    stats.func_unsafe_pct = (unsafe_func / total_func) * 100.0
+    def parse_coverage_stats(self):
+        """Parses *_unsafe_coverage.stat files"""
+        self._parse_glob("_unsafe_coverage.stat")
 
-                stats.calls_total_dyn = calls_dyn
-                stats.calls_unsafe_dyn = calls_unsafe_dyn
-                if calls_dyn > 0:
-                    stats.calls_unsafe_dyn_pct = (calls_unsafe_dyn / calls_dyn) * 100.0
+    def collect_all(self, max_workers: Optional[int] = None):
+        # One directory pass, dispatching on the experiment suffix
+        paths, suffixes = [], []
+        with os.scandir(self.output_dir) as it:
+            for e in it:
+                if not e.is_file(): continue
+                for suf in _PARSERS:
+                    if e.name.endswith(suf):
+                        paths.append(Path(e.path))
+                        suffixes.append(suf)
+                        break
 
-            except Exception as e:
-                print(f"Error parsing Counter stats for {crate}: {e}")
+        if not paths:
+            return
 
-    def parse_coverage_stats(self):
-        """Parses *_unsafe_coverage.stat files"""
-        for f in self.output_dir.glob("*_unsafe_coverage.stat"):
-            crate = f.stem.replace("_unsafe_coverage", "")
-            stats = self.get_crate(crate)
-            try:
-                content = f.read_text()
-                
-                # Parse all RUN blocks
-                # We want to identify distinct runs and filter out those with 0 execution
-                # But keep runs if they are the ONLY runs? 
-                # Heuristic: If we have multiple runs, discard the ones with 0 execution.
-                
-                runs = []
-                current_run = {'reg': set(), 'exec': set()}
-                current_section = None
-                
-                for line in content.splitlines():
-                    line = line.strip()
-                    if line.startswith("=== RUN_"):
-                        # Save previous run if it has data (or at least existed)
-                        # We only save if we processed a run.
-                        # Actually we can just start a new run object.
-                        # But we need to handle the first one.
-                        # Let's collect them all first.
-                        runs.append({'reg': set(), 'exec': set()})
-                        current_run = runs[-1]
-                        current_section = None
-                    elif line == "=== REGISTERED_LINES ===":
-                        current_section = "reg"
-                    elif line == "=== EXECUTED_LINES ===":
-                        current_section = "exec"
-                    elif line.startswith("==="):
-                        current_section = None
-                    elif line and current_section == "reg" and "reg" in current_run: # Check runs not empty
-                        current_run['reg'].add(line)
-                    elif line and current_section == "exec" and "exec" in current_run:
-                        current_run['exec'].add(line)
-                
-                # Filter runs
-                # If a run has 0 executed lines, but >0 registered lines, it might be a ghost run.
-                # However, if ALL runs have 0 executed lines, we keep them (0% coverage).
-                
-                valid_runs = []
-                runs_with_execution = [r for r in runs if len(r['exec']) > 0]
-                
-                if runs_with_execution:
-                    valid_runs = runs_with_execution
-                    # print(f"Filtered {len(runs) - len(valid_runs)} ghost runs for {crate}")
-                else:
-                    valid_runs = runs
-                
-                # Aggregate/Union
-                final_registered = set()
-                final_executed = set()
-                
-                for r in valid_runs:
-                    final_registered.update(r['reg'])
-                    final_executed.update(r['exec'])
-                        
-                stats.cov_registered = len(final_registered)
-                stats.cov_executed = len(final_executed)
-                if stats.cov_registered > 0:
-                    stats.cov_pct = (len(final_executed) / len(final_registered)) * 100.0
-                    
-            except Exception as e:
-                print(f"Error parsing Coverage stats for {crate}: {e}")
-
-    def collect_all(self):
-        self.parse_cpu_stats()
-        self.parse_heap_stats()
-        self.parse_unsafe_counter_stats()
-        self.parse_coverage_stats()
+        # A typical results dir (~19 crates x 4 stat files) parses faster
+        # in-process than it takes to start a pool
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        if workers == 1 or len(paths) < _PARALLEL_MIN_FILES:
+            for path, suffix in zip(paths, suffixes):
+                self.merge(*_parse_file(path, suffix))
+            return
+
+        # Each file only touches its own crate's field group, so files are
+        # parsed independently in worker processes and merged here
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for crate, fields in ex.map(_parse_file, paths, suffixes, chunksize=8):
+                self.merge(crate, fields)
 
     def print_table(self):
-        print("\n" + "="*145)
-        print(f"{'Benchmark':<15} | {'CPU %':<8} | {'Heap %':<8} | {'U.Load':<8} | {'U.Store':<8} | {'U.Call %':<8} | {'U.Inst %':<8} | {'Fn %':<8} | {'Cov %':<8}")
-        print("-" * 145)
+        # Rows are buffered and written in one go rather than printed one by one
+        rows = ["", "="*145]
+        rows.append(f"{'Benchmark':<15} | {'CPU %':<8} | {'Heap %':<8} | {'U.Load':<8} | {'U.Store':<8} | {'U.Call %':<8} | {'U.Inst %':<8} | {'Fn %':<8} | {'Cov %':<8}")
+        rows.append("-" * 145)
         
         for name, s in sorted(self.stats.items()):
             # CPU
@@ -271,13 +385,7 @@ class Aggregator:
             # Heap
             heap_str = f"{s.heap_unsafe_pct:.2f}%"
             
-            # Unsafe Loads/Stores -> Raw count for now? Or inferred % ?
-            # User wants match with LaTeX. LaTeX has percentages.
-            # Assuming Load % of Total Inst is useless. 
-            # I will print Pct of Unsafe Inst for columns that don't have totals? 
-            # Or Raw counts. Let's print Raw counts for Load/Store but Pct for Calls/Inst.
-            # Actually, let's print formatted string to keep options open
-            
+            # Unsafe Loads/Stores -> Raw counts
             load_str = f"{s.loads_unsafe}"
             store_str = f"{s.stores_unsafe}"
             
@@ -293,12 +401,12 @@ class Aggregator:
             # Coverage
             cov_str = f"{s.cov_pct:.2f}%"
             
-            print(f"{name:<15} | {cpu_str:<8} | {heap_str:<8} | {load_str:<8} | {store_str:<8} | {call_str:<8} | {inst_str:<8} | {fn_str:<8} | {cov_str:<8}")
+            rows.append(f"{name:<15} | {cpu_str:<8} | {heap_str:<8} | {load_str:<8} | {store_str:<8} | {call_str:<8} | {inst_str:<8} | {fn_str:<8} | {cov_str:<8}")
         
-        print("="*145 + "\n")
+        rows.append("="*145)
+        sys.stdout.write("\n".join(rows) + "\n\n")
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) > 1:
         d = Path(sys.argv[1])
     else:
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
 import shutil
+import shlex
 import subprocess
 import argparse
 import time
@@ -21,9 +23,15 @@ except ImportError:
 SCRIPT_DIR = Path(__file__).parent.absolute()
 BENCHMARK_DIR = SCRIPT_DIR / "benchmarks"
 PERF_DIR = SCRIPT_DIR / "perf"
-PERF_TARGET_DIR = PERF_DIR / "target" / "release"
-PERF_RLIB = PERF_TARGET_DIR / "libunsafe_perf.rlib"
-PERF_DEPS = PERF_TARGET_DIR / "deps"
+
+def perf_target_dir(feature):
+    """Cargo target dir for a perf feature; each feature keeps its own build."""
+    return PERF_DIR / "target" / feature
+
+def perf_artifacts(feature):
+    """Return (rlib, deps dir) of the perf library built with `feature`."""
+    release_dir = perf_target_dir(feature) / "release"
+    return release_dir / "libunsafe_perf.rlib", release_dir / "deps"
 
 # Experiment Definitions
 EXPERIMENTS = {
@@ -122,7 +130,6 @@ CRATE_CONFIGS = {
             "cargo build --release",
             "cargo bench"
         ],
-        "use_absolute_rustflags": True,
         "env": {"CC": "clang"}
     },
     "tokio": {
@@ -141,16 +148,56 @@ CRATE_CONFIGS = {
     }
 }
 
+# Matches a crate name against CRATE_CONFIGS: 'rayon' or 'rayon-1.5.0' -> 'rayon'.
+# Longest keys come first so e.g. 'rayon-core' is not taken for 'rayon'.
+_CRATE_CONFIG_RE = re.compile(
+    "(" + "|".join(map(re.escape, sorted(CRATE_CONFIGS, key=len, reverse=True))) + ")(?:-|$)"
+)
+
+def match_crate_config(crate_name):
+    """Return the CRATE_CONFIGS key that applies to crate_name, or None."""
+    m = _CRATE_CONFIG_RE.match(crate_name)
+    return m.group(1) if m else None
+
+def is_skipped(crate_name):
+    """Whether CRATE_CONFIGS marks crate_name to be skipped."""
+    return CRATE_CONFIGS.get(match_crate_config(crate_name), {}).get("skip", False)
+
+def list_benchmark_dirs():
+    """Map directory name -> path for every crate under BENCHMARK_DIR."""
+    return {d.name: d for d in BENCHMARK_DIR.iterdir() if d.is_dir()}
+
+def perf_rustflags(config):
+    """RUSTFLAGS that link the resolved perf library built for an experiment."""
+    perf_rlib, perf_deps = (p.resolve() for p in perf_artifacts(config["feature"]))
+    # Absolute paths hold for any cargo cwd, including workspace members
+    rustflags = [
+        "--emit=llvm-ir,link",
+        "-Z", "unstable-options",
+        f"--extern", f"force:unsafe_perf={perf_rlib}",
+        "-L", f"{perf_deps}"
+    ]
+    rustflags.extend(config["flags"])
+    return " ".join(rustflags)
+
+def move_result(src, dst):
+    """Move a stat file into place, renaming in place when on the same filesystem."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        # e.g. /tmp fallback on another filesystem
+        shutil.move(src, dst)
+
 def run_cmd(cmd, cwd=None, env=None, timeout=600):
-    """Run a shell command with default 10min timeout."""
+    """Run a command (shell-style split, no /bin/sh) with default 10min timeout."""
     print(f"Running: {cmd} (cwd={cwd})")
+    args = shlex.split(cmd) if isinstance(cmd, str) else cmd
     try:
         subprocess.run(
-            cmd, 
+            args, 
             cwd=cwd, 
             env=env, 
             check=True, 
-            shell=True,
             timeout=timeout
         )
         return True
@@ -160,6 +207,10 @@ def run_cmd(cmd, cwd=None, env=None, timeout=600):
     except subprocess.TimeoutExpired:
         print(f"Command timed out: {cmd}")
         return False
+    except OSError as e:
+        # e.g. the benchmark binary was not built
+        print(f"Command could not be started: {cmd}: {e}")
+        return False
 
 def build_perf(feature):
     """Build the perf library with the specified feature."""
@@ -173,37 +224,36 @@ def build_perf(feature):
     if not feature: # Skip build for native
         return
 
-    # Clean first ensures no feature mixing
-    run_cmd("cargo clean", cwd=PERF_DIR, env=env) 
+    # A separate target dir per feature avoids feature mixing without a
+    # `cargo clean`, so repeated runs rebuild incrementally
+    env["CARGO_TARGET_DIR"] = str(perf_target_dir(feature))
     
     cmd = f"cargo build --release --features {feature}"
     if not run_cmd(cmd, cwd=PERF_DIR, env=env):
         print(f"Failed to build perf library for {feature}")
         sys.exit(1)
 
-def run_crate(crate_name, exp_name, config, output_dir):
+def run_crate(crate_name, exp_name, config, output_dir, bench_dirs=None, rustflags=None):
     """Run experiment for a single crate."""
     print(f"Processing crate: {crate_name} [{exp_name}]")
     
-    crate_dir = BENCHMARK_DIR / crate_name
-    if not crate_dir.exists():
+    if bench_dirs is None:
+        bench_dirs = list_benchmark_dirs()
+
+    crate_dir = bench_dirs.get(crate_name)
+    if crate_dir is None:
         # Try finding fuzzy match
-        matches = [d for d in BENCHMARK_DIR.iterdir() if d.is_dir() and d.name.startswith(crate_name)]
+        matches = sorted(name for name in bench_dirs if name.startswith(crate_name))
         if matches:
-             crate_dir = matches[0]
+             crate_dir = bench_dirs[matches[0]]
              print(f"Found crate directory: {crate_dir.name}")
         else:
              print(f"Crate directory not found: {crate_name}")
              return
 
     # Check for custom config
-    # Matches 'rayon' or 'rayon-1.5.0' -> check if key is in name?
-    # Better: check if crate_name (dirname) starts with key
-    custom_config = None
-    for k, v in CRATE_CONFIGS.items():
-        if crate_name == k or crate_name.startswith(k + "-"):
-            custom_config = v
-            break
+    # Matches 'rayon' or 'rayon-1.5.0' -> check if crate_name (dirname) starts with key
+    custom_config = CRATE_CONFIGS.get(match_crate_config(crate_name))
             
     if custom_config and custom_config.get("skip"):
         print(f"Skipping {crate_name} as per config.")
@@ -216,53 +266,16 @@ def run_crate(crate_name, exp_name, config, output_dir):
     if "RUSTC" in env:
         del env["RUSTC"] # Ensure we use RUSTUP_TOOLCHAIN selection, not shell override
     
-    # Calculate relative paths for flags when running inside crate_dir
-    
-    # Calculate relative paths for flags when running inside crate_dir
-    # RUSTFLAGS paths must be relative to the CWD of the cargo process (crate_dir)
-    try:
-        # PERF_RLIB is typically "perf/target/release/libunsafe_perf.rlib" relative to root
-        # crate_dir is "benchmarks/foo" relative to root
-        # We need path from benchmarks/foo -> perf/target...
-        # Using os.path.relpath(target, start)
-        
-        # Resolve to absolute first to be safe for calculation, then convert to relative
-        abs_crate_dir = crate_dir.resolve()
-        abs_perf_rlib = PERF_RLIB.resolve()
-        abs_perf_deps = PERF_DEPS.resolve()
-        abs_output_dir = output_dir.resolve()
-        
-        rel_perf_rlib = os.path.relpath(abs_perf_rlib, abs_crate_dir)
-        rel_perf_deps = os.path.relpath(abs_perf_deps, abs_crate_dir)
-        rel_output_dir = os.path.relpath(abs_output_dir, abs_crate_dir)
-        
-    except Exception as e:
-        print(f"Error calculating relative paths: {e}")
-        return
+    # main() passes an already resolved output dir; only resolve it here
+    # when called with a relative one
+    abs_output_dir = output_dir if output_dir.is_absolute() else output_dir.resolve()
 
     # Construct RUSTFLAGS
     # Only inject unsafe_perf if NOT native experiment
     if exp_name != "native":
-        use_absolute = custom_config.get("use_absolute_rustflags", False) if custom_config else False
-        
-        if use_absolute or (custom_config and "cwd" in custom_config):
-            # Use absolute paths for workspace members
-            rustflags = [
-                "--emit=llvm-ir,link",
-                "-Z", "unstable-options",
-                f"--extern", f"force:unsafe_perf={PERF_RLIB.resolve()}",
-                "-L", f"{PERF_DEPS.resolve()}"
-            ]
-        else:
-            rustflags = [
-                "--emit=llvm-ir,link",
-                "-Z", "unstable-options",
-                f"--extern", f"force:unsafe_perf={PERF_RLIB}",
-                "-L", f"{PERF_DEPS}"
-            ]
-        rustflags.extend(config["flags"])
-        
-        env["RUSTFLAGS"] = " ".join(rustflags)
+        if rustflags is None:
+            rustflags = perf_rustflags(config)
+        env["RUSTFLAGS"] = rustflags
     
     env["UNSAFE_BENCH_OUTPUT_DIR"] = str(abs_output_dir)
     env["CARGO_PRIMARY_PACKAGE"] = "1"
@@ -309,14 +322,14 @@ def run_crate(crate_name, exp_name, config, output_dir):
         expected_file = output_dir / config["output_file"]
         if config["output_file"] and expected_file.exists():
             new_name = output_dir / f"{crate_name}_{config['output_file']}"
-            shutil.move(expected_file, new_name)
+            move_result(expected_file, new_name)
             print(f"Saved results to: {new_name.name}")
         else:
              fallback_file = Path("/tmp") / config["output_file"]
              if fallback_file.exists():
                  print(f"Found results in fallback location: {fallback_file}")
                  new_name = output_dir / f"{crate_name}_{config['output_file']}"
-                 shutil.move(fallback_file, new_name)
+                 move_result(fallback_file, new_name)
                  print(f"Saved results to: {new_name.name}")
              else:
                  # It implies no coverage/stats were written.
@@ -348,6 +361,7 @@ def main():
         base_output_dir = SCRIPT_DIR / "results" / timestamp
     
     base_output_dir.mkdir(parents=True, exist_ok=True)
+    base_output_dir = base_output_dir.resolve()
     print(f"Results will be stored in: {base_output_dir}")
 
     # Determine what to run
@@ -357,12 +371,15 @@ def main():
     else:
         experiments_to_run = [args.experiment]
 
+    # Scanned once and shared by every (crate, experiment) run
+    bench_dirs = list_benchmark_dirs()
+
     crates_to_run = []
     if args.crate:
         crates_to_run = [args.crate]
     else:
-        # Auto-discover crates
-        crates_to_run = [d.name for d in BENCHMARK_DIR.iterdir() if d.is_dir()]
+        # Auto-discover crates, dropping skipped ones before the experiment loop
+        crates_to_run = [name for name in bench_dirs if not is_skipped(name)]
 
     print(f"Experiments: {experiments_to_run}")
     print(f"Crates: {len(crates_to_run)}")
@@ -374,6 +391,7 @@ def main():
         
         # 1. Build Perf Lib
         build_perf(config["feature"])
+        rustflags = perf_rustflags(config) if config["feature"] else None
         
         # 2. Run Crates
         for crate in crates_to_run:
@@ -382,7 +400,7 @@ def main():
             # But coverage tracks cumulative runs.
             # Each execute appends.
             
-            run_crate(crate, exp, config, base_output_dir)
+            run_crate(crate, exp, config, base_output_dir, bench_dirs, rustflags)
 
     # Aggregation
     # Aggregation